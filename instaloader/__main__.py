@@ -345,6 +345,14 @@ def main():
                        'Requires the JSON metadata to be saved.')
     g_how.add_argument('--request-timeout', metavar='N', type=float,
                        help='seconds to wait before timing out a connection request')
+    g_how.add_argument('--parallel-downloads', metavar='N', type=int, default=1,
+                       help='Maximum number of pictures and videos of a post that are downloaded simultaneously. '
+                            'Defaults to 1. If greater than 1, a failing download cannot be skipped with CTRL+C; '
+                            'CTRL+C aborts Instaloader instead.')
+    g_how.add_argument('--prefetch-pages', action='store_true',
+                       help='Query the next page of posts, comments, followers etc. while the current page is still '
+                            'being processed. Saves waiting time, but if iteration stops early (e.g. with '
+                            '--fast-update or --count), one superfluous query counts towards Instagram\'s rate limit.')
 
     g_misc = parser.add_argument_group('Miscellaneous Options')
     g_misc.add_argument('-q', '--quiet', action='store_true',
@@ -389,6 +397,9 @@ def main():
         if args.commit_mode and args.no_metadata_json:
             raise SystemExit('--commit-mode requires JSON metadata to be saved.')
 
+        if args.parallel_downloads < 1:
+            raise SystemExit('--parallel-downloads must be at least 1.')
+
         loader = Instaloader(sleep=not args.no_sleep, quiet=args.quiet, user_agent=args.user_agent,
                              dirname_pattern=args.dirname_pattern, filename_pattern=args.filename_pattern,
                              download_pictures=not args.no_pictures,
@@ -400,7 +411,9 @@ def main():
                              storyitem_metadata_txt_pattern=storyitem_metadata_txt_pattern,
                              max_connection_attempts=args.max_connection_attempts,
                              request_timeout=args.request_timeout,
-                             commit_mode=args.commit_mode)
+                             commit_mode=args.commit_mode,
+                             parallel_downloads=args.parallel_downloads,
+                             prefetch_pages=args.prefetch_pages)
         _main(loader,
               args.profile,
               username=args.login.lower() if args.login is not None else None,
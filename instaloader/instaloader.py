@@ -4,15 +4,15 @@ import lzma
 import os
 import platform
 import re
-import shutil
 import string
 import sys
 import tempfile
+import threading
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from contextlib import contextmanager, suppress
 from datetime import datetime, timezone
 from functools import wraps
 from hashlib import md5
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable, Iterator, List, Optional, Set, Union
 
@@ -25,6 +25,9 @@ from .structures import (Highlight, JsonExportable, Post, PostLocation, Profile,
                          save_structure_to_file, load_structure_from_file)
 
 
+_FILE_EXTENSION_RE = re.compile('\\.[a-z0-9]*\\?')
+
+
 def get_default_session_filename(username: str) -> str:
     """Returns default session filename for given username."""
     dirname = tempfile.gettempdir() + "/" + ".instaloader-" + getpass.getuser()
@@ -61,21 +64,28 @@ def _retry_on_connection_error(func: Callable) -> Callable:
     decorator."""
     @wraps(func)
     def call(instaloader, *args, **kwargs):
-        try:
-            return func(instaloader, *args, **kwargs)
-        except (urllib3.exceptions.HTTPError, requests.exceptions.RequestException, ConnectionException) as err:
-            error_string = "{}({}): {}".format(func.__name__, ', '.join([repr(arg) for arg in args]), err)
-            if (kwargs.get('_attempt') or 1) == instaloader.context.max_connection_attempts:
-                raise ConnectionException(error_string) from None
-            instaloader.context.error(error_string + " [retrying; skip with ^C]", repeat_at_end=False)
+        error_string = None
+        while True:
             try:
+                if error_string is not None:
+                    instaloader.context.do_sleep()
+                return func(instaloader, *args, **kwargs)
+            except (urllib3.exceptions.HTTPError, requests.exceptions.RequestException, ConnectionException) as err:
+                error_string = "{}({}): {}".format(func.__name__, ', '.join([repr(arg) for arg in args]), err)
+                if (kwargs.get('_attempt') or 1) == instaloader.context.max_connection_attempts:
+                    raise ConnectionException(error_string) from None
+                if threading.current_thread() is threading.main_thread():
+                    instaloader.context.error(error_string + " [retrying; skip with ^C]", repeat_at_end=False)
+                else:
+                    # ^C is only delivered to the main thread, hence it cannot skip --parallel-downloads retries
+                    instaloader.context.error(error_string + " [retrying]", repeat_at_end=False)
                 if kwargs.get('_attempt'):
                     kwargs['_attempt'] += 1
                 else:
                     kwargs['_attempt'] = 2
-                instaloader.context.do_sleep()
-                return call(instaloader, *args, **kwargs)
             except KeyboardInterrupt:
+                if error_string is None:
+                    raise
                 instaloader.context.error("[skipped by user]", repeat_at_end=False)
                 raise ConnectionException(error_string) from None
     return call
@@ -143,6 +153,8 @@ class Instaloader:
     :param max_connection_attempts: :option:`--max-connection-attempts`
     :param commit_mode: :option:`--commit-mode`
     :param request_timeout: "option:`--request-timeout`, set per-request timeout (seconds)
+    :param parallel_downloads: :option:`--parallel-downloads`
+    :param prefetch_pages: :option:`--prefetch-pages`
 
     .. attribute:: context
 
@@ -166,9 +178,12 @@ class Instaloader:
                  storyitem_metadata_txt_pattern: str = None,
                  max_connection_attempts: int = 3,
                  request_timeout: Optional[float] = None,
-                 commit_mode: bool = False):
+                 commit_mode: bool = False,
+                 parallel_downloads: int = 1,
+                 prefetch_pages: bool = False):
 
-        self.context = InstaloaderContext(sleep, quiet, user_agent, max_connection_attempts, request_timeout)
+        self.context = InstaloaderContext(sleep, quiet, user_agent, max_connection_attempts, request_timeout,
+                                          parallel_downloads, prefetch_pages)
 
         # configuration parameters
         self.dirname_pattern = dirname_pattern or "{target}"
@@ -211,7 +226,9 @@ class Instaloader:
             storyitem_metadata_txt_pattern=self.storyitem_metadata_txt_pattern,
             max_connection_attempts=self.context.max_connection_attempts,
             request_timeout=self.context.request_timeout,
-            commit_mode=self.commit_mode)
+            commit_mode=self.commit_mode,
+            parallel_downloads=self.context.parallel_downloads,
+            prefetch_pages=self.context.prefetch_pages)
         yield new_loader
         self.context.error_log.extend(new_loader.context.error_log)
         new_loader.context.error_log = []  # avoid double-printing of errors
@@ -232,7 +249,7 @@ class Instaloader:
                      filename_suffix: Optional[str] = None, _attempt: int = 1) -> bool:
         """Downloads and saves picture with given url under given directory with given timestamp.
         Returns true, if file was actually downloaded, i.e. updated."""
-        urlmatch = re.search('\\.[a-z0-9]*\\?', url)
+        urlmatch = _FILE_EXTENSION_RE.search(url)
         file_extension = url[-3:] if urlmatch is None else urlmatch.group(0)[1:-1]
         if filename_suffix is not None:
             filename += '_' + filename_suffix
@@ -343,7 +360,7 @@ class Instaloader:
         except UnicodeEncodeError:
             self.context.log('txt', end=' ', flush=True)
         with open(filename, 'wb') as text_file:
-            shutil.copyfileobj(BytesIO(bcaption), text_file)
+            text_file.write(bcaption)
         os.utime(filename, (datetime.now().timestamp(), mtime.timestamp()))
 
     def save_location(self, filename: str, location: PostLocation, mtime: datetime) -> None:
@@ -353,7 +370,7 @@ class Instaloader:
                            "https://maps.google.com/maps?q={0},{1}&ll={0},{1}\n".format(location.lat,
                                                                                         location.lng))
         with open(filename, 'wb') as text_file:
-            shutil.copyfileobj(BytesIO(location_string.encode()), text_file)
+            text_file.write(location_string.encode())
         os.utime(filename, (datetime.now().timestamp(), mtime.timestamp()))
         self.context.log('geo', end=' ', flush=True)
 
@@ -400,6 +417,9 @@ class Instaloader:
 
         :param filename: Filename, or None to use default filename.
         :raises LoginRequiredException: If called without being logged in.
+
+        .. versionchanged:: 4.3
+           The session cookies are stored as versioned JSON rather than pickled.
         """
         if filename is None:
             assert self.context.username is not None
@@ -419,6 +439,11 @@ class Instaloader:
         If filename is None, the file with the default session path is loaded.
 
         :raises FileNotFoundError: If the file does not exist.
+        :raises InvalidArgumentException: If the file has been written by a newer version of Instaloader.
+
+        .. versionchanged:: 4.3
+           Loading pickled session files of earlier versions is deprecated. Unpickling can execute arbitrary code,
+           hence only load such files if you trust them.
         """
         if filename is None:
             filename = get_default_session_filename(username)
@@ -474,17 +499,34 @@ class Instaloader:
         self._committed = self.check_if_committed(filename)
         if self.download_pictures:
             if post.typename == 'GraphSidecar':
+                sidecar_items = []  # URL and filename suffix of each item to download
                 edge_number = 1
                 for sidecar_node in post.get_sidecar_nodes():
                     # Download picture or video thumbnail
                     if not sidecar_node.is_video or self.download_video_thumbnails is True:
-                        downloaded &= self.download_pic(filename=filename, url=sidecar_node.display_url,
-                                                        mtime=post.date_local, filename_suffix=str(edge_number))
+                        sidecar_items.append((sidecar_node.display_url, str(edge_number)))
                     # Additionally download video if available and desired
                     if sidecar_node.is_video and self.download_videos is True:
-                        downloaded &= self.download_pic(filename=filename, url=sidecar_node.video_url,
-                                                        mtime=post.date_local, filename_suffix=str(edge_number))
+                        sidecar_items.append((sidecar_node.video_url, str(edge_number)))
                     edge_number += 1
+                if self.context.parallel_downloads > 1:
+                    executor = ThreadPoolExecutor(self.context.parallel_downloads)
+                    futures = [executor.submit(self.download_pic, filename=filename, url=url, mtime=post.date_local,
+                                               filename_suffix=suffix) for url, suffix in sidecar_items]
+                    try:
+                        # Wait until all downloads are finished or one of them failed, whose exception result() raises
+                        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                        for future in done:
+                            downloaded &= future.result()
+                    finally:
+                        # After a failed download or ^C, do not start the downloads that are still queued
+                        for future in futures:
+                            future.cancel()
+                        executor.shutdown()
+                else:
+                    for url, suffix in sidecar_items:
+                        downloaded &= self.download_pic(filename=filename, url=url, mtime=post.date_local,
+                                                        filename_suffix=suffix)
             elif post.typename == 'GraphImage':
                 downloaded = self.download_pic(filename=filename, url=post.url, mtime=post.date_local)
             elif post.typename == 'GraphVideo':
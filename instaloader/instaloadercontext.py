@@ -1,23 +1,44 @@
 import hashlib
 import json
 import pickle
+import queue
 import random
 import re
 import shutil
 import sys
 import textwrap
+import threading
 import time
 import urllib.parse
+from collections import deque
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from functools import partial
+from functools import lru_cache, partial
 from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
 import requests
+import requests.adapters
 import requests.utils
 
 from .exceptions import *
 
+try:
+    # orjson decodes large GraphQL responses considerably faster than the json module
+    from orjson import loads as orjson_loads  # type: ignore
+except ImportError:
+    def _decode_json_response(resp: requests.Response) -> Any:
+        return resp.json()
+else:
+    def _decode_json_response(resp: requests.Response) -> Any:
+        return orjson_loads(resp.content)
+
+
+_SHARED_DATA_RE = re.compile(r'window\._sharedData = (.*);</script>')
+_ADDITIONAL_DATA_LOADED_RE = re.compile(r'window\.__additionalDataLoaded\([^{]+{"graphql":({.*})}\);</script>')
+
+# Version of the JSON format of session files written by save_session_to_file()
+_SESSION_FILE_VERSION = 1
+
 
 def copy_session(session: requests.Session, request_timeout: Optional[float] = None) -> requests.Session:
     """Duplicates a requests.Session."""
@@ -31,6 +52,12 @@ def copy_session(session: requests.Session, request_timeout: Optional[float] = N
     return new
 
 
+@lru_cache(maxsize=128)
+def _quote_referer(referer: str) -> str:
+    """Percent-encodes a referer. Cached, as graphql_node_list() passes the same referer for every page."""
+    return urllib.parse.quote(referer)
+
+
 def default_user_agent() -> str:
     return 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 ' \
            '(KHTML, like Gecko) Chrome/51.0.2704.79 Safari/537.36'
@@ -52,15 +79,37 @@ class InstaloaderContext:
     """
 
     def __init__(self, sleep: bool = True, quiet: bool = False, user_agent: Optional[str] = None,
-                 max_connection_attempts: int = 3, request_timeout: Optional[float] = None):
+                 max_connection_attempts: int = 3, request_timeout: Optional[float] = None,
+                 parallel_downloads: int = 1, prefetch_pages: bool = False):
 
         self.user_agent = user_agent if user_agent is not None else default_user_agent()
+
+        # Default HTTP headers, built once since they are needed for every GraphQL query. See _default_http_header().
+        self._default_header = {'Accept-Encoding': 'gzip, deflate',
+                                'Accept-Language': 'en-US,en;q=0.8',
+                                'Connection': 'keep-alive',
+                                'Content-Length': '0',
+                                'Host': 'www.instagram.com',
+                                'Origin': 'https://www.instagram.com',
+                                'Referer': 'https://www.instagram.com/',
+                                'User-Agent': self.user_agent,
+                                'X-Instagram-AJAX': '1',
+                                'X-Requested-With': 'XMLHttpRequest'}
+        self._default_header_empty_session = self._default_header.copy()
+        for header in ['Host', 'Origin', 'Referer', 'X-Instagram-AJAX', 'X-Requested-With']:
+            del self._default_header_empty_session[header]
+
         self.request_timeout = request_timeout
         self._session = self.get_anonymous_session()
         self.username = None
         self.sleep = sleep
         self.quiet = quiet
         self.max_connection_attempts = max_connection_attempts
+        self.parallel_downloads = parallel_downloads
+        self.prefetch_pages = prefetch_pages
+        # Anonymous sessions for downloading media, kept to reuse their connections. requests.Session is not
+        # documented to be thread-safe, hence each one is taken out of this queue while a request is being sent.
+        self._download_sessions = queue.LifoQueue()  # type: queue.LifoQueue[requests.Session]
         self._graphql_page_length = 50
         self._root_rhx_gis = None
         self.two_factor_auth_pending = None
@@ -69,8 +118,10 @@ class InstaloaderContext:
         self.error_log = []                      # type: List[str]
 
         # For the adaption of sleep intervals (rate control)
-        self._graphql_query_timestamps = dict()  # type: Dict[str, List[float]]
+        self._graphql_query_timestamps = dict()  # type: Dict[str, deque[float]]
         self._graphql_earliest_next_request_time = 0.0
+        # Guards the two attributes above, which graphql_node_list() also accesses from a thread when prefetching
+        self._ratecontrol_lock = threading.Lock()
 
         # Can be set to True for testing, disables supression of InstaloaderContext._error_catcher
         self.raise_all_errors = False
@@ -113,10 +164,11 @@ class InstaloaderContext:
     def close(self):
         """Print error log and close session"""
         if self.error_log and not self.quiet:
-            print("\nErrors occured:", file=sys.stderr)
-            for err in self.error_log:
-                print(err, file=sys.stderr)
+            # Join the error log into one string, rather than printing it with writes per entry and separator
+            print('\n'.join(["\nErrors occured:"] + self.error_log), file=sys.stderr)
         self._session.close()
+        while not self._download_sessions.empty():
+            self._download_sessions.get_nowait().close()
 
     @contextmanager
     def error_catcher(self, extra_info: Optional[str] = None):
@@ -136,23 +188,7 @@ class InstaloaderContext:
 
     def _default_http_header(self, empty_session_only: bool = False) -> Dict[str, str]:
         """Returns default HTTP header we use for requests."""
-        header = {'Accept-Encoding': 'gzip, deflate',
-                  'Accept-Language': 'en-US,en;q=0.8',
-                  'Connection': 'keep-alive',
-                  'Content-Length': '0',
-                  'Host': 'www.instagram.com',
-                  'Origin': 'https://www.instagram.com',
-                  'Referer': 'https://www.instagram.com/',
-                  'User-Agent': self.user_agent,
-                  'X-Instagram-AJAX': '1',
-                  'X-Requested-With': 'XMLHttpRequest'}
-        if empty_session_only:
-            del header['Host']
-            del header['Origin']
-            del header['Referer']
-            del header['X-Instagram-AJAX']
-            del header['X-Requested-With']
-        return header
+        return (self._default_header_empty_session if empty_session_only else self._default_header).copy()
 
     def get_anonymous_session(self) -> requests.Session:
         """Returns our default anonymous requests.Session object."""
@@ -167,14 +203,43 @@ class InstaloaderContext:
             session.request = partial(session.request, timeout=self.request_timeout) # type: ignore
         return session
 
+    def _new_download_session(self) -> requests.Session:
+        """Returns a new anonymous requests.Session for downloading media. Its connection pool is large enough for
+        :attr:`parallel_downloads`, as responses are streamed while the session is already sending other requests."""
+        session = self.get_anonymous_session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(self.parallel_downloads,
+                                                                 requests.adapters.DEFAULT_POOLSIZE))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
     def save_session_to_file(self, sessionfile):
         """Not meant to be used directly, use :meth:`Instaloader.save_session_to_file`."""
-        pickle.dump(requests.utils.dict_from_cookiejar(self._session.cookies), sessionfile)
+        sessiondata = {'session_file_version': _SESSION_FILE_VERSION,
+                       'cookies': requests.utils.dict_from_cookiejar(self._session.cookies)}
+        sessionfile.write(json.dumps(sessiondata).encode())
 
     def load_session_from_file(self, username, sessionfile):
-        """Not meant to be used directly, use :meth:`Instaloader.load_session_from_file`."""
+        """Not meant to be used directly, use :meth:`Instaloader.load_session_from_file`.
+
+        :raises InvalidArgumentException: If the session file has been written by a newer Instaloader version."""
+        sessiondata = sessionfile.read()
+        try:
+            sessionjson = json.loads(sessiondata.decode())
+        except (UnicodeDecodeError, json.decoder.JSONDecodeError):
+            sessionjson = None
+        if isinstance(sessionjson, dict) and 'session_file_version' in sessionjson:
+            if sessionjson['session_file_version'] > _SESSION_FILE_VERSION:
+                raise InvalidArgumentException("Session file version {} is not supported, please upgrade Instaloader."
+                                               .format(sessionjson['session_file_version']))
+            cookies = sessionjson['cookies']
+        else:
+            # Session files written by Instaloader < 4.3 are pickled. Unpickling a file can execute arbitrary code.
+            self.error("Warning: Loading session file in the deprecated pickle format. Only use session files you "
+                       "trust. Saving the session stores it as JSON.", repeat_at_end=False)
+            cookies = pickle.loads(sessiondata)
         session = requests.Session()
-        session.cookies = requests.utils.cookiejar_from_dict(pickle.load(sessionfile))
+        session.cookies = requests.utils.cookiejar_from_dict(cookies)
         session.headers.update(self._default_http_header())
         session.headers.update({'X-CSRFToken': session.cookies.get_dict()['csrftoken']})
         if self.request_timeout is not None:
@@ -286,14 +351,16 @@ class InstaloaderContext:
             time.sleep(min(random.expovariate(0.7), 5.0))
 
     def _dump_query_timestamps(self, current_time: float):
-        """Output the number of GraphQL queries grouped by their query_hash within the last time."""
+        """Output the number of GraphQL queries grouped by their query_hash within the last time.
+        Must be called with _ratecontrol_lock held."""
         windows = [10, 11, 15, 20, 30, 60]
-        print("GraphQL requests:", file=sys.stderr)
+        lines = ["GraphQL requests:"]
         for query_hash, times in self._graphql_query_timestamps.items():
-            print("  {}".format(query_hash), file=sys.stderr)
+            lines.append("  {}".format(query_hash))
             for window in windows:
                 reqs_in_sliding_window = sum(t > current_time - window * 60 for t in times)
-                print("    last {} minutes: {} requests".format(window, reqs_in_sliding_window), file=sys.stderr)
+                lines.append("    last {} minutes: {} requests".format(window, reqs_in_sliding_window))
+        print('\n'.join(lines), file=sys.stderr)
 
     def _graphql_request_count_per_sliding_window(self, query_hash: str) -> int:
         """Return how many GraphQL requests can be done within the sliding window."""
@@ -309,14 +376,16 @@ class InstaloaderContext:
         return max_reqs.get(query_hash) or min(max_reqs.values())
 
     def _graphql_query_waittime(self, query_hash: str, current_time: float, untracked_queries: bool = False) -> float:
-        """Calculate time needed to wait before GraphQL query can be executed."""
+        """Calculate time needed to wait before GraphQL query can be executed.
+        Must be called with _ratecontrol_lock held."""
         sliding_window = 660
         if query_hash not in self._graphql_query_timestamps:
-            self._graphql_query_timestamps[query_hash] = []
-        self._graphql_query_timestamps[query_hash] = list(filter(lambda t: t > current_time - 60 * 60,
-                                                                 self._graphql_query_timestamps[query_hash]))
-        reqs_in_sliding_window = list(filter(lambda t: t > current_time - sliding_window,
-                                             self._graphql_query_timestamps[query_hash]))
+            self._graphql_query_timestamps[query_hash] = deque()
+        timestamps = self._graphql_query_timestamps[query_hash]
+        # Timestamps are appended in ascending order, hence the outdated ones are at the left
+        while timestamps and timestamps[0] <= current_time - 60 * 60:
+            timestamps.popleft()
+        reqs_in_sliding_window = [t for t in timestamps if t > current_time - sliding_window]
         count_per_sliding_window = self._graphql_request_count_per_sliding_window(query_hash)
         if len(reqs_in_sliding_window) < count_per_sliding_window and not untracked_queries:
             return max(0, self._graphql_earliest_next_request_time - current_time)
@@ -332,38 +401,43 @@ class InstaloaderContext:
         :param untracked_queries: True, if 429 has been returned to apply 429 logic.
         """
         if not untracked_queries:
-            waittime = self._graphql_query_waittime(query_hash, time.monotonic(), untracked_queries)
+            with self._ratecontrol_lock:
+                waittime = self._graphql_query_waittime(query_hash, time.monotonic(), untracked_queries)
             assert waittime >= 0
             if waittime > 10:
                 self.log('\nToo many queries in the last time. Need to wait {} seconds, until {:%H:%M}.'
                          .format(waittime, datetime.now() + timedelta(seconds=waittime)))
             time.sleep(waittime)
-            if query_hash not in self._graphql_query_timestamps:
-                self._graphql_query_timestamps[query_hash] = [time.monotonic()]
-            else:
-                self._graphql_query_timestamps[query_hash].append(time.monotonic())
+            with self._ratecontrol_lock:
+                if query_hash not in self._graphql_query_timestamps:
+                    self._graphql_query_timestamps[query_hash] = deque([time.monotonic()])
+                else:
+                    self._graphql_query_timestamps[query_hash].append(time.monotonic())
         else:
             text_for_429 = ("HTTP error code 429 was returned because too many queries occured in the last time. "
                             "Please do not use Instagram in your browser or run multiple instances of Instaloader "
                             "in parallel.")
             print(textwrap.fill(text_for_429), file=sys.stderr)
-            current_time = time.monotonic()
-            waittime = self._graphql_query_waittime(query_hash, current_time, untracked_queries)
-            assert waittime >= 0
-            if waittime > 10:
-                self.log('The request will be retried in {} seconds, at {:%H:%M}.'
-                         .format(waittime, datetime.now() + timedelta(seconds=waittime)))
-            self._dump_query_timestamps(current_time)
+            with self._ratecontrol_lock:
+                current_time = time.monotonic()
+                waittime = self._graphql_query_waittime(query_hash, current_time, untracked_queries)
+                assert waittime >= 0
+                if waittime > 10:
+                    self.log('The request will be retried in {} seconds, at {:%H:%M}.'
+                             .format(waittime, datetime.now() + timedelta(seconds=waittime)))
+                self._dump_query_timestamps(current_time)
             time.sleep(waittime)
 
     def get_json(self, path: str, params: Dict[str, Any], host: str = 'www.instagram.com',
-                 session: Optional[requests.Session] = None, _attempt=1) -> Dict[str, Any]:
+                 session: Optional[requests.Session] = None, headers: Optional[Dict[str, Any]] = None,
+                 _attempt=1) -> Dict[str, Any]:
         """JSON request to Instagram.
 
         :param path: URL, relative to the given domain which defaults to www.instagram.com/
         :param params: GET parameters
         :param host: Domain part of the URL from where to download the requested JSON; defaults to www.instagram.com
         :param session: Session to use, or None to use self.session
+        :param headers: HTTP headers to add to the session's headers for this request; None values remove a header
         :return: Decoded response dictionary
         :raises QueryReturnedBadRequestException: When the server responds with a 400.
         :raises QueryReturnedNotFoundException: When the server responds with a 404.
@@ -372,83 +446,95 @@ class InstaloaderContext:
         is_graphql_query = 'query_hash' in params and 'graphql/query' in path
         is_iphone_query = host == 'i.instagram.com'
         is_other_query = not is_graphql_query and host == "www.instagram.com"
+        is_html_query = not is_graphql_query and not "__a" in params and host == "www.instagram.com"
+        # Query hashes under which this query is rate controlled
+        ratecontrol_queries = []  # type: List[str]
+        if is_graphql_query:
+            ratecontrol_queries.append(params['query_hash'])
+        if is_iphone_query:
+            ratecontrol_queries.append('iphone')
+        if is_other_query:
+            ratecontrol_queries.append('other')
+        url = 'https://{0}/{1}'.format(host, path)
         sess = session if session else self._session
-        try:
-            self.do_sleep()
-            if is_graphql_query:
-                self._ratecontrol_graphql_query(params['query_hash'])
-            if is_iphone_query:
-                self._ratecontrol_graphql_query('iphone')
-            if is_other_query:
-                self._ratecontrol_graphql_query('other')
-            resp = sess.get('https://{0}/{1}'.format(host, path), params=params, allow_redirects=False)
-            while resp.is_redirect:
-                redirect_url = resp.headers['location']
-                self.log('\nHTTP redirect from https://{0}/{1} to {2}'.format(host, path, redirect_url))
-                if redirect_url.startswith('https://www.instagram.com/accounts/login'):
-                    # alternate rate limit exceeded behavior
-                    raise TooManyRequestsException("429 Too Many Requests: redirected to login")
-                if redirect_url.startswith('https://{}/'.format(host)):
-                    resp = sess.get(redirect_url if redirect_url.endswith('/') else redirect_url + '/',
-                                    params=params, allow_redirects=False)
+        attempt = _attempt
+        error_string = None  # type: Optional[str]
+        retry_err = None  # type: Optional[Exception]
+        while True:
+            try:
+                if isinstance(retry_err, TooManyRequestsException):
+                    for query_hash in ratecontrol_queries:
+                        self._ratecontrol_graphql_query(query_hash, untracked_queries=True)
+                self.do_sleep()
+                for query_hash in ratecontrol_queries:
+                    self._ratecontrol_graphql_query(query_hash)
+                resp = sess.get(url, params=params, headers=headers, allow_redirects=False)
+                while resp.is_redirect:
+                    redirect_url = resp.headers['location']
+                    self.log('\nHTTP redirect from {0} to {1}'.format(url, redirect_url))
+                    if redirect_url.startswith('https://www.instagram.com/accounts/login'):
+                        # alternate rate limit exceeded behavior
+                        raise TooManyRequestsException("429 Too Many Requests: redirected to login")
+                    if redirect_url.startswith('https://{}/'.format(host)):
+                        resp = sess.get(redirect_url if redirect_url.endswith('/') else redirect_url + '/',
+                                        params=params, headers=headers, allow_redirects=False)
+                    else:
+                        break
+                if resp.status_code == 400:
+                    raise QueryReturnedBadRequestException("400 Bad Request")
+                if resp.status_code == 404:
+                    raise QueryReturnedNotFoundException("404 Not Found")
+                if resp.status_code == 429:
+                    raise TooManyRequestsException("429 Too Many Requests")
+                if resp.status_code != 200:
+                    raise ConnectionException("HTTP error code {}.".format(resp.status_code))
+                if is_html_query:
+                    match = _SHARED_DATA_RE.search(resp.text)
+                    if match is None:
+                        raise QueryReturnedNotFoundException("Could not find \"window._sharedData\" in html response.")
+                    resp_json = json.loads(match.group(1))
+                    entry_data = resp_json.get('entry_data')
+                    post_or_profile_page = list(entry_data.values())[0] if entry_data is not None else None
+                    if post_or_profile_page is None:
+                        raise ConnectionException("\"window._sharedData\" does not contain required keys.")
+                    # If GraphQL data is missing in `window._sharedData`, search for it in `__additionalDataLoaded`.
+                    if 'graphql' not in post_or_profile_page[0]:
+                        match = _ADDITIONAL_DATA_LOADED_RE.search(resp.text)
+                        if match is not None:
+                            post_or_profile_page[0]['graphql'] = json.loads(match.group(1))
+                    return resp_json
                 else:
-                    break
-            if resp.status_code == 400:
-                raise QueryReturnedBadRequestException("400 Bad Request")
-            if resp.status_code == 404:
-                raise QueryReturnedNotFoundException("404 Not Found")
-            if resp.status_code == 429:
-                raise TooManyRequestsException("429 Too Many Requests")
-            if resp.status_code != 200:
-                raise ConnectionException("HTTP error code {}.".format(resp.status_code))
-            is_html_query = not is_graphql_query and not "__a" in params and host == "www.instagram.com"
-            if is_html_query:
-                match = re.search(r'window\._sharedData = (.*);</script>', resp.text)
-                if match is None:
-                    raise QueryReturnedNotFoundException("Could not find \"window._sharedData\" in html response.")
-                resp_json = json.loads(match.group(1))
-                entry_data = resp_json.get('entry_data')
-                post_or_profile_page = list(entry_data.values())[0] if entry_data is not None else None
-                if post_or_profile_page is None:
-                    raise ConnectionException("\"window._sharedData\" does not contain required keys.")
-                # If GraphQL data is missing in `window._sharedData`, search for it in `__additionalDataLoaded`.
-                if 'graphql' not in post_or_profile_page[0]:
-                    match = re.search(r'window\.__additionalDataLoaded\([^{]+{"graphql":({.*})}\);</script>',
-                                      resp.text)
-                    if match is not None:
-                        post_or_profile_page[0]['graphql'] = json.loads(match.group(1))
+                    resp_json = _decode_json_response(resp)
+                if 'status' in resp_json and resp_json['status'] != "ok":
+                    if 'message' in resp_json:
+                        raise ConnectionException("Returned \"{}\" status, message \"{}\"."
+                                                  .format(resp_json['status'], resp_json['message']))
+                    else:
+                        raise ConnectionException("Returned \"{}\" status.".format(resp_json['status']))
                 return resp_json
-            else:
-                resp_json = resp.json()
-            if 'status' in resp_json and resp_json['status'] != "ok":
-                if 'message' in resp_json:
-                    raise ConnectionException("Returned \"{}\" status, message \"{}\".".format(resp_json['status'],
-                                                                                               resp_json['message']))
-                else:
-                    raise ConnectionException("Returned \"{}\" status.".format(resp_json['status']))
-            return resp_json
-        except (ConnectionException, json.decoder.JSONDecodeError, requests.exceptions.RequestException) as err:
-            error_string = "JSON Query to {}: {}".format(path, err)
-            if _attempt == self.max_connection_attempts:
-                if isinstance(err, QueryReturnedNotFoundException):
-                    raise QueryReturnedNotFoundException(error_string) from err
+            except (ConnectionException, json.decoder.JSONDecodeError, requests.exceptions.RequestException) as err:
+                error_string = "JSON Query to {}: {}".format(path, err)
+                if attempt == self.max_connection_attempts:
+                    if isinstance(err, QueryReturnedNotFoundException):
+                        raise QueryReturnedNotFoundException(error_string) from err
+                    else:
+                        raise ConnectionException(error_string) from err
+                if threading.current_thread() is threading.main_thread():
+                    self.error(error_string + " [retrying; skip with ^C]", repeat_at_end=False)
                 else:
-                    raise ConnectionException(error_string) from err
-            self.error(error_string + " [retrying; skip with ^C]", repeat_at_end=False)
-            try:
-                if is_graphql_query and isinstance(err, TooManyRequestsException):
-                    self._ratecontrol_graphql_query(params['query_hash'], untracked_queries=True)
-                if is_iphone_query and isinstance(err, TooManyRequestsException):
-                    self._ratecontrol_graphql_query('iphone', untracked_queries=True)
-                if is_other_query and isinstance(err, TooManyRequestsException):
-                    self._ratecontrol_graphql_query('other', untracked_queries=True)
-                return self.get_json(path=path, params=params, host=host, session=sess, _attempt=_attempt + 1)
+                    # ^C is only delivered to the main thread, hence it cannot skip retries of prefetched pages
+                    self.error(error_string + " [retrying]", repeat_at_end=False)
+                retry_err = err
+                attempt += 1
             except KeyboardInterrupt:
+                if error_string is None:
+                    raise
                 self.error("[skipped by user]", repeat_at_end=False)
-                raise ConnectionException(error_string) from err
+                raise ConnectionException(error_string) from retry_err
 
     def graphql_query(self, query_hash: str, variables: Dict[str, Any],
-                      referer: Optional[str] = None, rhx_gis: Optional[str] = None) -> Dict[str, Any]:
+                      referer: Optional[str] = None, rhx_gis: Optional[str] = None,
+                      session: Optional[requests.Session] = None) -> Dict[str, Any]:
         """
         Do a GraphQL Query.
 
@@ -456,30 +542,32 @@ class InstaloaderContext:
         :param variables: Variables for the Query.
         :param referer: HTTP Referer, or None.
         :param rhx_gis: 'rhx_gis' variable as somewhere returned by Instagram, needed to 'sign' request
+        :param session: Session to use, or None to use self.session
         :return: The server's response dictionary.
         """
-        with copy_session(self._session, self.request_timeout) as tmpsession:
-            tmpsession.headers.update(self._default_http_header(empty_session_only=True))
-            del tmpsession.headers['Connection']
-            del tmpsession.headers['Content-Length']
-            tmpsession.headers['authority'] = 'www.instagram.com'
-            tmpsession.headers['scheme'] = 'https'
-            tmpsession.headers['accept'] = '*/*'
-            if referer is not None:
-                tmpsession.headers['referer'] = urllib.parse.quote(referer)
-
-            variables_json = json.dumps(variables, separators=(',', ':'))
-
-            if rhx_gis:
-                #self.log("rhx_gis {} query_hash {}".format(rhx_gis, query_hash))
-                values = "{}:{}".format(rhx_gis, variables_json)
-                x_instagram_gis = hashlib.md5(values.encode()).hexdigest()
-                tmpsession.headers['x-instagram-gis'] = x_instagram_gis
-
-            resp_json = self.get_json('graphql/query',
-                                      params={'query_hash': query_hash,
-                                              'variables': variables_json},
-                                      session=tmpsession)
+        headers = {}  # type: Dict[str, Optional[str]]
+        headers.update(self._default_header_empty_session)
+        # Unset these headers of self._session for GraphQL queries
+        headers['Connection'] = None
+        headers['Content-Length'] = None
+        headers['authority'] = 'www.instagram.com'
+        headers['scheme'] = 'https'
+        headers['accept'] = '*/*'
+        if referer is not None:
+            headers['referer'] = _quote_referer(referer)
+
+        variables_json = json.dumps(variables, separators=(',', ':'))
+
+        if rhx_gis:
+            #self.log("rhx_gis {} query_hash {}".format(rhx_gis, query_hash))
+            values = "{}:{}".format(rhx_gis, variables_json)
+            x_instagram_gis = hashlib.md5(values.encode()).hexdigest()
+            headers['x-instagram-gis'] = x_instagram_gis
+
+        resp_json = self.get_json('graphql/query',
+                                  params={'query_hash': query_hash,
+                                          'variables': variables_json},
+                                  session=session, headers=headers)
         if 'status' not in resp_json:
             self.error("GraphQL response did not contain a \"status\" field.")
         return resp_json
@@ -491,17 +579,18 @@ class InstaloaderContext:
                           first_data: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
         """Retrieve a list of GraphQL nodes."""
 
-        def _query():
+        def _query(session: Optional[requests.Session] = None):
             query_variables['first'] = self._graphql_page_length
             try:
-                return edge_extractor(self.graphql_query(query_hash, query_variables, query_referer, rhx_gis))
+                return edge_extractor(self.graphql_query(query_hash, query_variables, query_referer, rhx_gis,
+                                                         session))
             except QueryReturnedBadRequestException:
                 new_page_length = int(self._graphql_page_length / 2)
                 if new_page_length >= 12:
                     self._graphql_page_length = new_page_length
                     self.error("HTTP Error 400 (Bad Request) on GraphQL Query. Retrying with shorter page length.",
                                repeat_at_end=False)
-                    return _query()
+                    return _query(session)
                 else:
                     raise
 
@@ -509,11 +598,44 @@ class InstaloaderContext:
             data = first_data
         else:
             data = _query()
-        yield from (edge['node'] for edge in data['edges'])
-        while data['page_info']['has_next_page']:
-            query_variables['after'] = data['page_info']['end_cursor']
-            data = _query()
+        if not self.prefetch_pages:
+            yield from (edge['node'] for edge in data['edges'])
+            while data['page_info']['has_next_page']:
+                query_variables['after'] = data['page_info']['end_cursor']
+                data = _query()
+                yield from (edge['node'] for edge in data['edges'])
+            return
+
+        # Query the next page in a thread while the nodes of the current page are being processed. The thread uses
+        # its own session, and it is a daemon thread, so that it does not delay the exit of Instaloader if the
+        # iteration is aborted while a page is still being queried.
+        cursors = queue.Queue()  # type: queue.Queue[Optional[str]]
+        pages = queue.Queue(maxsize=1)  # type: queue.Queue[Union[Dict[str, Any], Exception]]
+
+        def _prefetch(session: requests.Session):
+            with session:
+                cursor = cursors.get()
+                while cursor is not None:
+                    query_variables['after'] = cursor
+                    try:
+                        pages.put(_query(session))
+                    except Exception as err:  # pylint:disable=broad-except
+                        pages.put(err)
+                    cursor = cursors.get()
+
+        prefetch_session = copy_session(self._session, self.request_timeout)
+        threading.Thread(target=_prefetch, args=(prefetch_session,), daemon=True).start()
+        try:
+            while data['page_info']['has_next_page']:
+                cursors.put(data['page_info']['end_cursor'])
+                yield from (edge['node'] for edge in data['edges'])
+                page = pages.get()
+                if isinstance(page, Exception):
+                    raise page
+                data = page
             yield from (edge['node'] for edge in data['edges'])
+        finally:
+            cursors.put(None)
 
     def get_iphone_json(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """JSON request to ``i.instagram.com``.
@@ -540,7 +662,7 @@ class InstaloaderContext:
         self.log(filename, end=' ', flush=True)
         with open(filename, 'wb') as file:
             if isinstance(resp, requests.Response):
-                shutil.copyfileobj(resp.raw, file)
+                shutil.copyfileobj(resp.raw, file, length=1 << 20)
             else:
                 file.write(resp)
 
@@ -552,12 +674,20 @@ class InstaloaderContext:
         :raises ConnectionException: When download failed.
 
         .. versionadded:: 4.2.1"""
-        with self.get_anonymous_session() as anonymous_session:
-            resp = anonymous_session.get(url, stream=True)
+        try:
+            session = self._download_sessions.get_nowait()
+        except queue.Empty:
+            session = self._new_download_session()
+        try:
+            resp = session.get(url, stream=True)
+        finally:
+            self._download_sessions.put(session)
         if resp.status_code == 200:
             resp.raw.decode_content = True
             return resp
         else:
+            # Release the connection of the streamed response back to the session's pool
+            resp.close()
             if resp.status_code == 403:
                 # suspected invalid URL signature
                 raise QueryReturnedForbiddenException("403 when accessing {}.".format(url))
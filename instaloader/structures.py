@@ -11,6 +11,11 @@ from .exceptions import *
 from .instaloadercontext import InstaloaderContext
 
 
+# These regular expressions are from jStassen, adjusted to use Python's \w to support Unicode
+# http://blog.jstassen.com/2016/03/code-regex-for-instagram-username-and-hashtags/
+_HASHTAG_RE = re.compile(r"(?:#)(\w(?:(?:\w|(?:\.(?!\.))){0,28}(?:\w))?)")
+_MENTION_RE = re.compile(r"(?:@)(\w(?:(?:\w|(?:\.(?!\.))){0,28}(?:\w))?)")
+
 PostSidecarNode = namedtuple('PostSidecarNode', ['is_video', 'display_url', 'video_url'])
 PostSidecarNode.__doc__ = "Item of a Sidecar Post."
 PostSidecarNode.is_video.__doc__ = "Whether this node is a video."
@@ -242,22 +247,16 @@ class Post:
     @property
     def caption_hashtags(self) -> List[str]:
         """List of all lowercased hashtags (without preceeding #) that occur in the Post's caption."""
-        if not self.caption:
+        if not self.caption or '#' not in self.caption:
             return []
-        # This regular expression is from jStassen, adjusted to use Python's \w to support Unicode
-        # http://blog.jstassen.com/2016/03/code-regex-for-instagram-username-and-hashtags/
-        hashtag_regex = re.compile(r"(?:#)(\w(?:(?:\w|(?:\.(?!\.))){0,28}(?:\w))?)")
-        return re.findall(hashtag_regex, self.caption.lower())
+        return _HASHTAG_RE.findall(self.caption.lower())
 
     @property
     def caption_mentions(self) -> List[str]:
         """List of all lowercased profiles that are mentioned in the Post's caption, without preceeding @."""
-        if not self.caption:
+        if not self.caption or '@' not in self.caption:
             return []
-        # This regular expression is from jStassen, adjusted to use Python's \w to support Unicode
-        # http://blog.jstassen.com/2016/03/code-regex-for-instagram-username-and-hashtags/
-        mention_regex = re.compile(r"(?:@)(\w(?:(?:\w|(?:\.(?!\.))){0,28}(?:\w))?)")
-        return re.findall(mention_regex, self.caption.lower())
+        return _MENTION_RE.findall(self.caption.lower())
 
     @property
     def pcaption(self) -> str:
@@ -4,8 +4,9 @@ import os
 import shutil
 import tempfile
 import unittest
+from collections import deque
 from itertools import islice
-from typing import Dict, List
+from typing import Dict
 
 import instaloader
 
@@ -23,7 +24,7 @@ EMPTY_PROFILE = "not_public"
 EMPTY_PROFILE_ID = 1928659031
 
 # Preserve query timestamps (rate control) between tests to not get rate limited
-instaloadercontext_query_timestamps = dict()  # type: Dict[str, List[float]]
+instaloadercontext_query_timestamps = dict()  # type: Dict[str, deque[float]]
 
 
 class TestInstaloaderAnonymously(unittest.TestCase):
@@ -65,6 +66,10 @@ class TestInstaloaderAnonymously(unittest.TestCase):
     def test_public_profile_paging(self):
         self.post_paging_test(instaloader.Profile.from_username(self.L.context, PUBLIC_PROFILE).get_posts())
 
+    def test_public_profile_paging_prefetched(self):
+        self.L.context.prefetch_pages = True
+        self.post_paging_test(instaloader.Profile.from_username(self.L.context, PUBLIC_PROFILE).get_posts())
+
     def test_profile_pic_download(self):
         self.L.download_profiles({self.L.check_profile_id(PUBLIC_PROFILE)}, posts=False, raise_errors=True)
 
@@ -157,6 +162,14 @@ class TestInstaloaderLoggedIn(TestInstaloaderAnonymously):
     def test_test_login(self):
         self.assertEqual(OWN_USERNAME, self.L.test_login())
 
+    def test_session_file_roundtrip(self):
+        sessionfile = os.path.join(self.dir, 'session-' + OWN_USERNAME)
+        self.L.save_session_to_file(sessionfile)
+        loader = instaloader.Instaloader()
+        loader.load_session_from_file(OWN_USERNAME, sessionfile)
+        self.assertEqual(OWN_USERNAME, loader.test_login())
+        loader.close()
+
     def test_followees_and_stories(self):
         profile = instaloader.Profile.from_username(self.L.context, OWN_USERNAME)
         followees = set(islice(profile.get_followees(), PAGING_MAX_COUNT))